@@ -3,7 +3,8 @@ import sqlite3
 
 def main():
     with sqlite3.connect("./sample_data/db.sqlite") as con:
-        df = pd.read_sql("select * from main.book_taxi_trips limit 100", con)
+        chunks = pd.read_sql_query("select * from main.book_taxi_trips limit 100", con, chunksize=100)
+        df = next(chunks)
         print(df)
         print(df.dtypes)
 
@@ -1,9 +1,16 @@
 import sqlite3
 import csv
+from itertools import islice
+
+CHUNK_SIZE = 10000
 
 def populate_db():
     con = sqlite3.connect("./sample_data/db.sqlite")
     cur = con.cursor()
+    cur.execute("PRAGMA journal_mode=WAL")
+    cur.execute("PRAGMA synchronous=NORMAL")
+    cur.execute("PRAGMA temp_store=MEMORY")
+    cur.execute("PRAGMA cache_size=-200000")
     cur.execute("""
         create table raw_taxi_trips(
             id char(7),
@@ -24,22 +31,27 @@ def populate_db():
         reader = csv.reader(f)
         next(reader)
 
-        cur.executemany("""
-            insert into raw_taxi_trips(
-                id,
-                vendor_id,
-                pickup_datetime,
-                dropoff_datetime,
-                passengers,
-                pickup_longitude,
-                pickup_latitude,
-                dropoff_longitude,
-                dropoff_latitude,
-                store_and_fwd_flag,
-                trip_duration
-            )
-            values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, reader)
+        cur.execute("BEGIN")
+        while True:
+            chunk = list(islice(reader, CHUNK_SIZE))
+            if not chunk:
+                break
+            cur.executemany("""
+                insert into raw_taxi_trips(
+                    id,
+                    vendor_id,
+                    pickup_datetime,
+                    dropoff_datetime,
+                    passengers,
+                    pickup_longitude,
+                    pickup_latitude,
+                    dropoff_longitude,
+                    dropoff_latitude,
+                    store_and_fwd_flag,
+                    trip_duration
+                )
+                values (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, chunk)
     con.commit()
     con.close()
 
@@ -49,8 +61,8 @@ def main():
     con = sqlite3.connect("./sample_data/db.sqlite")
     cur = con.cursor()
     cur.execute("select * from main.raw_taxi_trips limit 100")
-    results = cur.fetchall()
-    print(results)
+    for row in cur:
+        print(row)
 
 
 if __name__ == "__main__":
@@ -20,14 +20,17 @@ class DuplicatedFieldException(Exception):
     def __init__(self, table: BaseTable, field: BaseField):
         self.table = table
         self.field = field
-        message = f"Field {field._pname} already exists on table {table._pname}"
-        super().__init__(message)
+        super().__init__(table, field)
+
+    def __str__(self) -> str:
+        return f"Field {self.field._pname} already exists on table {self.table._pname}"
 
 
-class UndefinedFieldException(Exception):
+class UndefinedFieldException(AttributeError):
     """
     An Exception that is raised when we try to access a field that does not exist
-    within a table.
+    within a table. It subclasses AttributeError so that attribute probes such
+    as hasattr behave as expected on tables.
 
     Args:
         table (BaseTable): The table in which we tried to acess the field
@@ -39,8 +42,10 @@ class UndefinedFieldException(Exception):
     def __init__(self, table: BaseTable, field: str):
         self.table = table
         self.field = field
-        message = f"Field {field} was not defined in table {table._pname}"
-        super().__init__(message)
+        super().__init__(table, field)
+
+    def __str__(self) -> str:
+        return f"Field {self.field} was not defined in table {self.table._pname}"
 
 
 class UnregisteredSourceException(Exception):
@@ -1,13 +1,72 @@
 from __future__ import annotations
-from typing import List, Mapping, TYPE_CHECKING, Set, Optional
+from typing import FrozenSet, List, Mapping, TYPE_CHECKING, Sequence, Set, Optional, overload
 from abc import ABC, abstractmethod
+from contextvars import ContextVar
 from string import Formatter
-from .exceptions import NoTableContextSetException
+import re
+from .exceptions import NoTableContextSetException, UndefinedFieldException
 if TYPE_CHECKING:
     from .tables import BaseTable
 
-# TODO: Create a fully fledged context manager for handling field creation
-CURRENT_TABLE_CONTEXT: List[BaseTable] = []
+# Table currently open as a context manager. Fields are added to this table
+# when created.
+_TABLE_CONTEXT: ContextVar[Optional[BaseTable]] = ContextVar("loom_table_ctx", default=None)
+
+
+def get_current_table() -> Optional[BaseTable]:
+    """
+    Returns the table currently open as a context manager.
+
+    Returns:
+        BaseTable, optional: The current table, or None if no table is open.
+    """
+    return _TABLE_CONTEXT.get()
+
+
+def set_current_table(table: Optional[BaseTable]) -> None:
+    """
+    Sets the table currently open as a context manager. This is used by tables
+    when entering and exiting their context.
+
+    Args:
+        table (BaseTable, optional): The table to set, or None to clear it.
+    """
+    _TABLE_CONTEXT.set(table)
+
+
+class _TableContextView(Sequence["BaseTable"]):
+    """
+    Read-only list-like view over the current table context, kept so that code
+    using CURRENT_TABLE_CONTEXT[0] keeps working.
+    """
+    def _as_list(self) -> List[BaseTable]:
+        table = get_current_table()
+        return [] if table is None else [table]
+
+    def __len__(self) -> int:
+        return 0 if get_current_table() is None else 1
+
+    @overload
+    def __getitem__(self, index: int) -> BaseTable: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> Sequence[BaseTable]: ...
+
+    def __getitem__(self, index):
+        return self._as_list()[index]
+
+    def __repr__(self) -> str:
+        return repr(self._as_list())
+
+
+CURRENT_TABLE_CONTEXT: Sequence[BaseTable] = _TableContextView()
+
+_FMT = Formatter()
+# Matches the common "{alias.field}" placeholder. Expressions using any other
+# formatter syntax, or with braces left unmatched, fall back to the Formatter
+# based parser.
+_FIELD_RE = re.compile(r"\{([A-Za-z_]\w*)\.([A-Za-z_]\w*)\}")
+_USE_FIELD_RE = True
 
 
 class BaseField(ABC):
@@ -40,6 +99,8 @@ class BaseField(ABC):
 
     """
 
+    __slots__ = ("_pname", "_lname", "_table")
+
     _pname: str
     _lname: str
     _table: BaseTable
@@ -57,9 +118,9 @@ class BaseField(ABC):
         Returns:
             BaseTable: The table that was retrieved from the table context.
         """
-        if len(CURRENT_TABLE_CONTEXT) == 0:
+        table = get_current_table()
+        if table is None:
             raise NoTableContextSetException(self._pname)
-        table = CURRENT_TABLE_CONTEXT[0]
         table.add_field(self)
         return table
 
@@ -120,11 +181,13 @@ class RawField(BaseField):
     Attributes:
         See documentation for BaseField.
     """
+    __slots__ = ()
+
     def get_sources(self) -> Set[BaseField]:
-        return set([self])
+        return {self}
 
     def get_lineage(self) -> Set[BaseField]:
-        return set([self])
+        return {self}
 
     def get_expression(self) -> str:
         return self._pname
@@ -142,6 +205,10 @@ class DerivedField(BaseField):
     Attributes:
         _expression (str): Expression used to create the field.
         _sources (Set[BaseField]): Fields that are used to calculate this field.
+        _lineage_cache (FrozenSet[BaseField], optional): Lineage of this field, computed
+            on the first call to get_lineage.
+        _rendered_cache (str, optional): SQL expression for this field, rendered
+            on the first call to get_expression.
 
     When writing expressions one should use string formatter fields to refer to
     other fields. For example, imagine you want to take the absolute value from
@@ -151,13 +218,19 @@ class DerivedField(BaseField):
         "abs({t1.income})"        
 
     """
+    __slots__ = ("_expression", "_sources", "_lineage_cache", "_rendered_cache")
+
     _expression: str
     _sources: Set[BaseField]
+    _lineage_cache: Optional[FrozenSet[BaseField]]
+    _rendered_cache: Optional[str]
 
     def __init__(self, pname: str, expression: str, lname: Optional[str] = None):
         super().__init__(pname, lname=lname)
         self._expression = expression
         self._sources = get_fields_from_expr(expression, self._table._sources)
+        self._lineage_cache = None
+        self._rendered_cache = None
 
     def get_expression(self) -> str:
         """
@@ -168,8 +241,10 @@ class DerivedField(BaseField):
         Returns:
             str: A SQL expression to create the field.
         """
-        expression = self._expression.format(**self._table._sources)
-        return f"{expression} as {self._pname}"
+        if self._rendered_cache is None:
+            expression = self._expression.format_map(self._table._sources)
+            self._rendered_cache = f"{expression} as {self._pname}"
+        return self._rendered_cache
 
     def get_sources(self) -> Set[BaseField]:
         """
@@ -189,10 +264,30 @@ class DerivedField(BaseField):
 
         Returns:
             Set[BaseField]: A set containing the fields
-        """        
+
+        The pipeline is walked as a DAG, so fields that are reached through more
+        than one path are only expanded once. Fields are not mutated after they
+        are created, so the result is cached on the first call.
+        """
+        if self._lineage_cache is not None:
+            return set(self._lineage_cache)
         lineage: Set[BaseField] = set()
-        for f in self._sources:
-            lineage = lineage | f.get_lineage()
+        visited: Set[int] = set()
+        stack: List[BaseField] = list(self._sources)
+        while stack:
+            f = stack.pop()
+            if id(f) in visited:
+                continue
+            visited.add(id(f))
+            if isinstance(f, RawField):
+                lineage.add(f)
+            elif not isinstance(f, DerivedField):
+                lineage.update(f.get_lineage())
+            elif f._lineage_cache is not None:
+                lineage.update(f._lineage_cache)
+            else:
+                stack.extend(f._sources)
+        self._lineage_cache = frozenset(lineage)
         return lineage
 
 
@@ -208,10 +303,48 @@ def get_fields_from_expr(expression: str, context: Mapping[str, BaseTable]) -> S
             provide fields used in the expression. This is usually set as the
             tables registered as the source for another table.
     """
-    f = Formatter()
+    if _USE_FIELD_RE:
+        matches = _FIELD_RE.findall(expression)
+        if len(matches) == expression.count("{") == expression.count("}"):
+            return {_lookup_field(context, alias, fname) for alias, fname in matches}
+    return _get_fields_from_expr_formatter(expression, context)
+
+
+def get_single_field_from_expr(expression: str, context: Mapping[str, BaseTable]) -> BaseField:
+    """
+    This function returns the single field used in an expression. Expressions
+    with exactly one "{alias.field}" placeholder are resolved from the first
+    regex match, without building a set of fields.
+
+    Args:
+        expression (str): The expression being parsed.
+        context (Mapping[str, BaseTable]): A mapping listing all tables that can
+            provide fields used in the expression.
+
+    Returns:
+        BaseField: The field used in the expression.
+    """
+    if _USE_FIELD_RE and expression.count("{") == expression.count("}") == 1:
+        match = _FIELD_RE.search(expression)
+        if match is not None:
+            return _lookup_field(context, match.group(1), match.group(2))
+    field_list = get_fields_from_expr(expression, context)
+    assert len(field_list) == 1
+    return field_list.pop()
+
+
+def _lookup_field(context: Mapping[str, BaseTable], alias: str, fname: str) -> BaseField:
+    table = context[alias]
+    try:
+        return table._fields[fname]
+    except KeyError:
+        raise UndefinedFieldException(table, fname) from None
+
+
+def _get_fields_from_expr_formatter(expression: str, context: Mapping[str, BaseTable]) -> Set[BaseField]:
     field_list = set()
-    for _, field_name, _, _ in f.parse(expression):
+    for _, field_name, _, _ in _FMT.parse(expression):
         if field_name:
-            field, _ = f.get_field(field_name, [], context)
+            field, _ = _FMT.get_field(field_name, [], context)
             field_list.add(field)
     return field_list
@@ -1,12 +1,32 @@
 from __future__ import annotations
 from abc import ABC
-from typing import Iterable, Dict, TYPE_CHECKING, Optional, Set
+from typing import Iterable, Dict, TYPE_CHECKING, Optional, Set, Tuple
 from inspect import cleandoc
 from .exceptions import DuplicatedFieldException, UndefinedFieldException, UnregisteredSourceException
-from .fields import CURRENT_TABLE_CONTEXT
+from .fields import get_current_table, set_current_table
 if TYPE_CHECKING:
     from .fields import BaseField
 
+_DESCRIBE_TMPL = cleandoc("""
+    {lname}
+
+    Schema: {schema}
+    Physical Name: {pname}
+
+    Fields:
+        {fields}
+""")
+
+_QUERY_TMPL = cleandoc("""
+    create table {new_table} as
+    select
+        {select_expr}
+    from
+        {from_expr}
+    {where_expr}
+    {groupby_expr};
+""")
+
 
 class BaseTable(ABC):
     """
@@ -25,11 +45,14 @@ class BaseTable(ABC):
     are being created into.
 
     """
+    __slots__ = ("_schema", "_pname", "_lname", "_alias", "_fields", "_fields_tuple")
+
     _schema: str
     _pname: str
     _lname: str
     _alias: str
     _fields: Dict[str, BaseField]
+    _fields_tuple: Tuple[BaseField, ...]
 
     def __init__(self, schema: str, pname: str, lname: Optional[str] = None, alias: Optional[str] = None):
         self._schema = schema
@@ -37,18 +60,20 @@ class BaseTable(ABC):
         self._lname = lname if lname else pname
         self._alias = alias if alias else pname
         self._fields = {}
+        self._fields_tuple = ()
 
     def __enter__(self):
-        global CURRENT_TABLE_CONTEXT
-        if len(CURRENT_TABLE_CONTEXT) > 0:
+        if get_current_table() is not None:
             raise RuntimeError()
-        CURRENT_TABLE_CONTEXT.append(self)
+        set_current_table(self)
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        global CURRENT_TABLE_CONTEXT
-        if self not in CURRENT_TABLE_CONTEXT:
+        if get_current_table() is not self:
             raise RuntimeError()
-        CURRENT_TABLE_CONTEXT.remove(self)
+        # Nested contexts are not allowed, so the value before __enter__ was
+        # always None. Setting it back keeps no state on the table itself,
+        # which may be entered from several threads or tasks at once.
+        set_current_table(None)
 
     def add_field(self, field: BaseField):
         """
@@ -59,21 +84,13 @@ class BaseTable(ABC):
 
         TODO: Reduce coupling with BaseField
         """
-        if field._pname in self._fields:
+        if self._fields.setdefault(field._pname, field) is not field:
             raise DuplicatedFieldException(self, field)
-        self._fields[field._pname] = field
+        self._fields_tuple = self._fields_tuple + (field,)
 
     def describe(self, verbose: bool = False) -> str:
-        fields = "\n    ".join(["- " + f.describe() for f in self._fields.values()])
-        return cleandoc("""
-            {lname}
-
-            Schema: {schema}
-            Physical Name: {pname}
-
-            Fields:
-                {fields}
-        """).format(
+        fields = "\n    ".join("- " + f.describe() for f in self._fields_tuple)
+        return _DESCRIBE_TMPL.format(
             lname=self._lname,
             schema=self._schema,
             pname=self._pname,
@@ -81,9 +98,10 @@ class BaseTable(ABC):
         )
 
     def __getitem__(self, key: str) -> BaseField:
-        if key not in self._fields:
-            raise UndefinedFieldException(self, key)
-        return self._fields[key]
+        try:
+            return self._fields[key]
+        except KeyError:
+            raise UndefinedFieldException(self, key) from None
 
     def __repr__(self) -> str:
         return str(self)
@@ -92,11 +110,23 @@ class BaseTable(ABC):
         return f"{self._schema}.{self._pname} as {self._alias}"
 
     def __getattr__(self, key: str):
-        return self.__getitem__(key)
+        # Dunder names are never looked up as fields. This keeps Python's own
+        # attribute probes (copy, pickle) cheap. _fields is read directly so a
+        # table that was not initialized yet does not recurse into __getattr__.
+        if key.startswith("__"):
+            raise AttributeError(key)
+        try:
+            fields = object.__getattribute__(self, "_fields")
+        except AttributeError:
+            raise AttributeError(key) from None
+        try:
+            return fields[key]
+        except KeyError:
+            raise UndefinedFieldException(self, key) from None
 
 
 class RawTable(BaseTable):
-    pass
+    __slots__ = ()
 
 
 class DerivedTable(BaseTable):
@@ -109,17 +139,47 @@ class DerivedTable(BaseTable):
         lname (str): The logical name of the table (Human readable name)
         alias (str, optional): An alias to be used when generating queries involving
             this table. If not specified the physical name is used.
+
+    The rendered query and each of its components are cached after the first
+    call to the respective getter. The caches are cleared whenever a field is
+    added to the table or the group by keys are changed.
     """
+    __slots__ = (
+        "_sources", "_from_expression", "_groupby",
+        "_groupby_sql", "_query_cache", "_query_bytes_cache", "_select_cache", "_from_cache"
+    )
+
     _sources: Dict[str, BaseTable]
-    _source_expression: str
+    _from_expression: str
     _groupby: Set[BaseField]
+    _groupby_sql: str
+    _query_cache: Optional[str]
+    _query_bytes_cache: Optional[bytes]
+    _select_cache: Dict[int, str]
+    _from_cache: Optional[str]
 
     def __init__(self, schema: str, pname: str, sources: Iterable[BaseTable], from_expression: str, 
                  lname: Optional[str] = None, alias: Optional[str] = None):
         super().__init__(schema, pname, lname=lname, alias=alias)
         self._groupby = set()
+        self._groupby_sql = ""
         self._sources = self._process_sources(sources)
         self._from_expression = from_expression
+        self._select_cache = {}
+        self._invalidate_cache()
+
+    def _invalidate_cache(self) -> None:
+        """
+        Clears the cached query and query components for this table.
+        """
+        self._query_cache = None
+        self._query_bytes_cache = None
+        self._select_cache.clear()
+        self._from_cache = None
+
+    def add_field(self, field: BaseField):
+        super().add_field(field)
+        self._invalidate_cache()
 
     @staticmethod
     def _process_sources(sources: Iterable[BaseTable]) -> Dict[str, BaseTable]:
@@ -147,6 +207,12 @@ class DerivedTable(BaseTable):
                 will be used for the group by.
         """
         self._groupby = set(fields)
+        if len(self._groupby) == 0:
+            self._groupby_sql = ""
+        else:
+            statement = ",\n".join(f._pname for f in self._groupby)
+            self._groupby_sql = f"group by \n {statement}"
+        self._invalidate_cache()
 
     def get_source(self, key: str) -> BaseTable:
         if key not in self._sources:
@@ -160,8 +226,12 @@ class DerivedTable(BaseTable):
         Args:
             indent (int, optional): Indent level for the statements, in whitespaces (Default: 0)
         """
-        statement = ",\n".join([f.get_expression() for f in self._fields.values()])
-        return statement.replace("\n", "\n"+indent*" ")
+        if indent not in self._select_cache:
+            newline = "\n" + indent*" "
+            self._select_cache[indent] = ("," + newline).join(
+                f.get_expression().replace("\n", newline) for f in self._fields_tuple
+            )
+        return self._select_cache[indent]
 
     def get_from(self) -> str:
         """
@@ -171,20 +241,19 @@ class DerivedTable(BaseTable):
         Returns:
             str: String containing the SQL from expression.
         """
-        return self._from_expression.format(**self._sources)
+        if self._from_cache is None:
+            self._from_cache = self._from_expression.format_map(self._sources)
+        return self._from_cache
 
     def get_groupby(self) -> str:
         """
-        Generates the group by SQL expression for this table based on the fields
-        listed as group by keys.
+        Returns the group by SQL expression for this table based on the fields
+        listed as group by keys. The expression is rendered when groupby is called.
 
         Returns:
             str: String containing the SQL group by expression.
         """
-        if len(self._groupby) == 0:
-            return ""
-        statement = ",\n".join([f._pname for f in self._groupby])
-        return f"group by \n {statement}"
+        return self._groupby_sql
 
     def get_query(self) -> str:
         """
@@ -193,18 +262,24 @@ class DerivedTable(BaseTable):
         Returns:
             str: String containing the query.
         """
-        return cleandoc("""
-            create table {new_table} as
-            select
-                {select_expr}
-            from
-                {from_expr}
-            {where_expr}
-            {groupby_expr};
-        """).format(
-            new_table=self._pname,
-            select_expr=self.get_select(indent=4),
-            from_expr=self.get_from(),
-            where_expr="",
-            groupby_expr=self.get_groupby()
-        )
+        if self._query_cache is None:
+            self._query_cache = _QUERY_TMPL.format(
+                new_table=self._pname,
+                select_expr=self.get_select(indent=4),
+                from_expr=self.get_from(),
+                where_expr="",
+                groupby_expr=self.get_groupby()
+            )
+        return self._query_cache
+
+    def get_query_bytes(self) -> bytes:
+        """
+        Generates the query that create the table, encoded as UTF-8. Useful for
+        consumers that take bytes, such as files opened in binary mode.
+
+        Returns:
+            bytes: UTF-8 encoded query.
+        """
+        if self._query_bytes_cache is None:
+            self._query_bytes_cache = self.get_query().encode("utf-8")
+        return self._query_bytes_cache
@@ -1,7 +1,15 @@
 from __future__ import annotations
 from inspect import cleandoc
 from typing import Optional
-from .fields import CURRENT_TABLE_CONTEXT, DerivedField, get_fields_from_expr
+from .exceptions import NoTableContextSetException
+from .fields import DerivedField, get_current_table, get_single_field_from_expr
+
+_BOOK_TMPL = cleandoc("""
+    case
+        when ({flag_expr}) and ({time_expr}) then {aggregator}({metric_expr})
+        else null
+    end
+""")
 
 
 def from_single(expression: str) -> DerivedField:
@@ -19,10 +27,10 @@ def from_single(expression: str) -> DerivedField:
     Returns:
         DerivedField: The newly created field.
     """
-    table = CURRENT_TABLE_CONTEXT[0]
-    field_list = get_fields_from_expr(expression, table._sources)
-    assert len(field_list) == 1
-    field = field_list.pop()
+    table = get_current_table()
+    if table is None:
+        raise NoTableContextSetException(expression)
+    field = get_single_field_from_expr(expression, table._sources)
     return DerivedField(
         field._pname,
         expression,
@@ -32,12 +40,7 @@ def from_single(expression: str) -> DerivedField:
 
 def book_feature(pname: str, flag_expr: str, time_expr: str, metric_expr: str,
                  aggregator: str, lname: Optional[str] = None) -> DerivedField:
-    expression = cleandoc("""
-        case
-            when ({flag_expr}) and ({time_expr}) then {aggregator}({metric_expr})
-            else null
-        end
-    """).format(flag_expr=flag_expr, time_expr=time_expr, metric_expr=metric_expr, aggregator=aggregator)
+    expression = _BOOK_TMPL.format(flag_expr=flag_expr, time_expr=time_expr, metric_expr=metric_expr, aggregator=aggregator)
     return DerivedField(
         pname,
         expression,
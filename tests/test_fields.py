@@ -1,6 +1,7 @@
 from loom.tables import DerivedTable, RawTable
 from loom.fields import RawField, DerivedField
-from loom.exceptions import DuplicatedFieldException, NoTableContextSetException 
+from loom.transformations import from_single
+from loom.exceptions import DuplicatedFieldException, NoTableContextSetException, UndefinedFieldException
 import pytest
 
 
@@ -38,4 +39,94 @@ def test_add_duplicated_fields():
             RawField("test_field_pname", "test_field_lname")  
             field2 = RawField("test_field_pname", "test_field_lname")  
         assert einfo.value.table == table
-        assert einfo.value.field == field2
\ No newline at end of file
+        assert einfo.value.field == field2
+
+
+def test_fields_have_no_instance_dict():
+    table_1 = RawTable("test_schema", "test_pname_1", alias="a")
+    with table_1:
+        field_1 = RawField("test_field_pname")
+    table_2 = DerivedTable("test_schema", "test_pname_2", [table_1], "{a}", alias="b")
+    with table_2:
+        field_2 = DerivedField("test_derived_pname", "{a.test_field_pname}")
+
+    for obj in (table_1, table_2, field_1, field_2):
+        assert not hasattr(obj, "__dict__")
+
+
+def test_derived_field_undefined_source_field():
+    table_1 = RawTable("test_schema", "test_pname_1", alias="a")
+    with table_1:
+        RawField("test_field_pname")
+    table_2 = DerivedTable("test_schema", "test_pname_2", [table_1], "{a}", alias="b")
+    with pytest.raises(UndefinedFieldException) as einfo:
+        with table_2:
+            DerivedField("test_derived_pname", "{a.undefined_field_pname}")
+    assert einfo.value.table is table_1
+    assert einfo.value.field == "undefined_field_pname"
+
+
+def test_from_single():
+    table_1 = RawTable("test_schema", "test_pname_1", alias="a")
+    with table_1:
+        field_1 = RawField("test_field_pname", "test_field_lname")
+    table_2 = DerivedTable("test_schema", "test_pname_2", [table_1], "{a}", alias="b")
+    with table_2:
+        field_2 = from_single("cast({a.test_field_pname} as int)")
+    table_3 = DerivedTable("test_schema", "test_pname_3", [table_1], "{a}", alias="c")
+    with table_3:
+        field_3 = from_single("'{{a}}' || {a.test_field_pname}")
+
+    assert field_2._pname == "test_field_pname"
+    assert field_2._lname == "test_field_lname"
+    assert field_2.get_sources() == {field_1}
+    assert field_3.get_sources() == {field_1}
+
+    table_4 = DerivedTable("test_schema", "test_pname_4", [table_1], "{a}", alias="d")
+    with table_4:
+        with pytest.raises(ValueError):
+            from_single("{a.test_field_pname}}")
+
+
+def test_derived_field_lineage():
+    table_1 = RawTable("test_schema", "test_pname_1", alias="a")
+    with table_1:
+        field_1 = RawField("test_field1_pname")
+        field_2 = RawField("test_field2_pname")
+    table_2 = DerivedTable("test_schema", "test_pname_2", [table_1], "{a}", alias="b")
+    with table_2:
+        DerivedField("test_derived1_pname", "{a.test_field1_pname} + 1")
+        DerivedField("test_derived2_pname", "{a.test_field1_pname} * {a.test_field2_pname}")
+    table_3 = DerivedTable("test_schema", "test_pname_3", [table_2], "{b}", alias="c")
+    with table_3:
+        field_3 = DerivedField("test_derived3_pname", "{b.test_derived1_pname} - {b.test_derived2_pname}")
+
+    assert field_3.get_lineage() == {field_1, field_2}
+    lineage = field_3.get_lineage()
+    lineage.add(field_3)
+    assert field_3.get_lineage() == {field_1, field_2}
+
+
+def test_derived_field_sources_with_escaped_braces():
+    table_1 = RawTable("test_schema", "test_pname_1", alias="a")
+    with table_1:
+        field_1 = RawField("test_field1_pname")
+        field_2 = RawField("test_field2_pname")
+    table_2 = DerivedTable("test_schema", "test_pname_2", [table_1], "{a}", alias="b")
+    with table_2:
+        field_3 = DerivedField("test_derived_pname", "'{{' || {a.test_field1_pname} || {a.test_field2_pname}")
+
+    assert field_3.get_sources() == {field_1, field_2}
+    assert field_3.get_expression() == "'{' || a.test_field1_pname || a.test_field2_pname as test_derived_pname"
+
+
+def test_derived_field_unmatched_closing_brace():
+    table_1 = RawTable("test_schema", "test_pname_1", alias="a")
+    with table_1:
+        RawField("test_field_pname")
+    table_2 = DerivedTable("test_schema", "test_pname_2", [table_1], "{a}", alias="b")
+    with table_2:
+        with pytest.raises(ValueError):
+            DerivedField("test_derived1_pname", "{a.test_field_pname} }")
+        with pytest.raises(ValueError):
+            DerivedField("test_derived2_pname", "{a.test_field_pname}}")
\ No newline at end of file
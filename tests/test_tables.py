@@ -1,6 +1,7 @@
 from loom.tables import DerivedTable, RawTable
+from threading import Barrier, Thread
 from loom.fields import RawField, DerivedField
-from loom.exceptions import DuplicatedFieldException, NoTableContextSetException 
+from loom.exceptions import DuplicatedFieldException, NoTableContextSetException, UndefinedFieldException
 import pytest
 
 def test_create_table():
@@ -16,6 +17,57 @@ def test_get_field_from_table():
         field = RawField("test_field_pname", "test_field_lname")
     assert table.test_field_pname is field
 
+def test_get_undefined_field_from_table():
+    table = RawTable("test_schema", "test_pname", "test_lname")
+    with table:
+        RawField("test_field_pname", "test_field_lname")
+    with pytest.raises(UndefinedFieldException):
+        table.undefined_field_pname
+    with pytest.raises(UndefinedFieldException):
+        table["undefined_field_pname"]
+    assert not hasattr(table, "undefined_field_pname")
+    assert not hasattr(table, "__wrapped__")
+
+def test_nested_table_context():
+    table_1 = RawTable("test_schema", "test_pname_1")
+    table_2 = RawTable("test_schema", "test_pname_2")
+    with pytest.raises(RuntimeError):
+        with table_1:
+            with table_2:
+                pass
+    with pytest.raises(NoTableContextSetException):
+        RawField("test_field_pname")
+
+def test_underscore_prefixed_field():
+    table_1 = RawTable("test_schema", "test_pname_1", alias="a")
+    with table_1:
+        field_1 = RawField("_id")
+    table_2 = DerivedTable("test_schema", "test_pname_2", [table_1], "{a}", alias="b")
+    with table_2:
+        DerivedField("test_derived_pname", "{a._id}+1")
+    assert table_1._id is field_1
+    assert "a._id+1 as test_derived_pname" in table_2.get_query()
+
+def test_table_context_across_threads():
+    table = RawTable("test_schema", "test_pname")
+    barrier = Barrier(2)
+    errors = []
+
+    def enter_table():
+        try:
+            with table:
+                barrier.wait(timeout=5)
+            barrier.wait(timeout=5)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [Thread(target=enter_table) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+
 def test_create_derived_table():
     table_1 = RawTable("test_schema", "test_pname", "test_lname")     
     with table_1:
@@ -30,4 +82,25 @@ def test_create_derived_field():
     with table_2:  
         field_2 = DerivedField("test_derived_pname", "{test_pname.test_field_pname}")
     assert table_2.test_derived_pname == field_2
-    assert field_1 in field_2.get_sources()
\ No newline at end of file
+    assert field_1 in field_2.get_sources()
+
+
+def test_derived_table_query_cache():
+    table_1 = RawTable("test_schema", "test_pname_1", alias="a")
+    with table_1:
+        RawField("test_field_pname")
+    table_2 = DerivedTable("test_schema", "test_pname_2", [table_1], "{a}", alias="b")
+    with table_2:
+        DerivedField("test_derived1_pname", "{a.test_field_pname}")
+    query = table_2.get_query()
+    assert table_2.get_query() is query
+
+    with table_2:
+        DerivedField("test_derived2_pname", "{a.test_field_pname} + 1")
+    query = table_2.get_query()
+    assert "a.test_field_pname + 1 as test_derived2_pname" in query
+
+    table_2.groupby([table_2.test_derived1_pname])
+    assert table_2.get_query() != query
+    assert "group by \n test_derived1_pname" in table_2.get_query()
+    assert table_2.get_query_bytes() == table_2.get_query().encode("utf-8")
\ No newline at end of file